@@ -4,11 +4,15 @@
 import time
 
 from owlbear.app import Owlbear
+from owlbear.logging import setup_logger
 from owlbear.request import Request
 from owlbear.response import json_response, Response
 from owlbear.types import WrappedRequestHandler
 
 
+log = setup_logger("example.app")
+
+
 class MyApp(Owlbear):
 
     def __init__(self):
@@ -26,15 +30,16 @@ app = MyApp()
 @app.middleware
 async def example_middleware(request: Request,
                              next_handler: WrappedRequestHandler) -> Response:
-    print("foo!")
+    log.debug("middleware enter")
     # do sutff pre; can return here and next_handler won't run
-    request.data.start_time = time.time()
+    # monotonic_ns is immune to clock jumps and skips the float conversion
+    request.data.start_time = time.monotonic_ns()
 
     resp = await next_handler(request)
     # do stuff post; can return here and return value will override
 
-    duration = time.time() - request.data.start_time
-    print(f"Elapsed sec: {duration}")
+    duration_ms = (time.monotonic_ns() - request.data.start_time) / 1e6
+    log.info("Elapsed ms: %s", duration_ms)
 
     return resp
 
@@ -14,33 +14,60 @@ from owlbear.types import ExceptionHandler, ExceptionTypes, Methods, Middleware,
 class Owlbear:
     """The main app server class"""
 
+    __slots__ = ('logger', 'router', 'exception_handlers', '_exc_match_cache', )
+
     def __init__(self, *, logger: Optional[logging.Logger]=None):
         self.logger = logger or setup_logger("owlbear")
         self.router = Router(logger=logger)
         self.exception_handlers = []
+        self._exc_match_cache = {}
 
     async def __call__(self, message, channels):
         """The uvicorn interface"""
         request = Request(self, message, channels.get('body'))
-        self.logger.debug("Request", raw_data=pprint.pformat(request.raw_request))
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            self.logger.debug("Request raw=%s", pprint.pformat(request.raw_request))
 
         try:
             response = await self.router.dispatch(request)
-            self.logger.debug("Response", raw_data=pprint.pformat(response._form_full_response()))
+            if debug_enabled:
+                self.logger.debug("Response raw=%s", pprint.pformat(response._form_full_response()))
             await response.send_to(channels['reply'])
         except Exception as e:
-            for exception_types, handler in reversed(self.exception_handlers):
-                if isinstance(e, exception_types):
-                    response = await handler(request, e)
+            response = None
+            for handler in self._handlers_for_exception(e):
+                response = await handler(request, e)
+
+                if response is not None:
+                    break
 
-                    if response is not None:
-                        break
-            else:
+            if response is None:
                 response = await default_exception_handler(request, e)
 
-            self.logger.debug("Response", raw_data=pprint.pformat(response._form_full_response()))
+            if debug_enabled:
+                self.logger.debug("Response raw=%s", pprint.pformat(response._form_full_response()))
             await response.send_to(channels['reply'])
 
+    def _handlers_for_exception(self, e: Exception):
+        """Return the registered handlers matching an exception, memoized by type
+
+        The registration-order isinstance scan only runs on the first
+        exception of a given concrete type; afterwards matching is a
+        single dict lookup.
+        """
+        etype = type(e)
+        handlers = self._exc_match_cache.get(etype)
+        if handlers is None:
+            handlers = tuple(
+                handler
+                for exception_types, handler in reversed(self.exception_handlers)
+                if issubclass(etype, exception_types)
+            )
+            self._exc_match_cache[etype] = handlers
+
+        return handlers
+
     def url_for(self, handler_name: str, method: str='GET', param_args: Optional[dict]=None) -> str:
         """
 
@@ -82,6 +109,7 @@ class Owlbear:
             handler (ExceptionHandler): the function to handle the exception
         """
         self.exception_handlers.append((exception_types, handler))
+        self._exc_match_cache.clear()
 
     def route(self, uri_path: str, methods: Methods=('GET', )) -> Callable[[RequestHandler], RequestHandler]:
         """Decorator that wraps add_route
@@ -135,10 +163,7 @@ class Owlbear:
             base_path (str): the path to merge them in on
 
         """
-        if isinstance(app, Owlbear):
-            self.router.attach(app.router, base_path)
-        else:
-            self.router.attach(app, base_path)
+        self.router.attach(getattr(app, 'router', app), base_path)
 
     def static(self, prefix: str, local_dir: str, only_files: Optional[List[str]]=None):
         """
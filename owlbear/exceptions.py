@@ -1,15 +1,17 @@
 # -*- coding: utf-8 -*-
 """Exception handling functionality (types and example)"""
-import sys
-import traceback
 from typing import  Optional
 
+from owlbear.logging import setup_logger
 from owlbear.request import Request
 from owlbear.response import Response
 
 
+logger = setup_logger("owlbear.exceptions")
+
+
 async def default_exception_handler(request: Request, e: Exception) -> Optional[Response]:
-    """Catches all exceptions, prints a message and traceback to stderr, and returns a text/plain 500
+    """Catches all exceptions, logs a message and traceback, and returns a text/plain 500
 
     Args:
         request (Request): the Owlbear request
@@ -18,8 +20,7 @@ async def default_exception_handler(request: Request, e: Exception) -> Optional[
     Returns:
 
     """
-    print(request, file=sys.stderr)
-    traceback.print_exc(file=sys.stderr)
+    logger.error("Unhandled exception during %s", request, exc_info=e)
     resp = Response()
     resp.status = 500
     resp.content_type = "text/plain"
@@ -1,16 +1,46 @@
 # -*- coding: utf-8 -*-
 """Logging setup"""
 import logging
+import logging.handlers
+import queue
 import sys
 
+# one queue, listener thread, and handler serve every owlbear logger;
+# a listener per setup_logger call would mean one writer thread (and one
+# duplicate line) per module that configures its logger first
+_log_handler = None
+
+
+def _get_log_handler(log_level) -> logging.handlers.QueueHandler:
+    global _log_handler
+
+    if _log_handler is None:
+        # writing to stdout under the stream lock would block the event
+        # loop; hand records to a queue and let a background thread write
+        stream_handler = logging.StreamHandler(stream=sys.stdout)
+        stream_handler.setLevel(log_level)
+
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        listener.start()
+
+        _log_handler = logging.handlers.QueueHandler(log_queue)
+        _log_handler.setLevel(log_level)
+        _log_handler.listener = listener  # keep the listener thread alive
+
+    return _log_handler
+
+
 def setup_logger(logger_name: str="owlbear"):
     log_level = logging.INFO
     logger = logging.getLogger(logger_name)
     logger.setLevel(log_level)
 
     if not logger.hasHandlers():
-        log_handler = logging.StreamHandler(stream=sys.stdout)
-        log_handler.setLevel(log_level)
-        logger.addHandler(log_handler)
+        logger.addHandler(_get_log_handler(log_level))
+        # the handler already writes this logger's records; if a parent
+        # (e.g. "owlbear" after a child module imported first) gains its
+        # own handler later, propagating would emit every record twice
+        logger.propagate = False
 
     return logger
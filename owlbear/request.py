@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
 """Classes wrapping ASGI requests in a nicer interface"""
 
-import http.cookies
+import functools
 import re
+import sys
 from typing import Tuple
 import urllib.parse
 
 
+# interned ASGI scope keys make the dict lookups pointer-equality checks
+_KEY_PATH = sys.intern('path')
+_KEY_METHOD = sys.intern('method')
+_KEY_SCHEME = sys.intern('scheme')
+_KEY_QUERY_STRING = sys.intern('query_string')
+_KEY_HEADERS = sys.intern('headers')
+_KEY_BODY = sys.intern('body')
+
+
 class FormDataError(Exception):
     """Represents an error handling form data"""
     pass
@@ -20,18 +30,37 @@ class RequestData:
 # parts from https://github.com/defnull/multipart/blob/master/multipart.py
 # MIT license Copyright (c) 2010, Marcel Hellkamp
 _special = re.escape('()<>@,;:\\"/[]?={} \t')
-_re_special = re.compile('[%s]' % _special)
 _qstr = '"(?:\\\\.|[^"])*"'
 _value = '(?:[^%s]+|%s)' % (_special, _qstr)
 _option = '(?:;|^)\s*([^%s]+)\s*=\s*(%s)' % (_special, _value)
 _re_option = re.compile(_option) # key=value part of an Content-Type like header
+_re_option_finditer = _re_option.finditer
+
+# HTTP methods are a closed set; mapping the common spellings to their
+# canonical (interned) form avoids an .upper() allocation per request
+_METHODS = {m: m for m in ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')}
+_METHODS.update({m.lower(): canonical for m, canonical in tuple(_METHODS.items())})
+
+# repeated hits on the same URL re-parse the same query string; cache the
+# parsed form (as immutable tuples) keyed on the raw string, but skip
+# unusually long query strings to bound per-entry memory
+_QS_CACHE_MAX_LEN = 4096
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_query_string_cached(qs: str) -> tuple:
+    return tuple(
+        (key, tuple(val) if isinstance(val, list) else val)
+        for key, val in Request._parse_query_string(qs).items()
+    )
 
 
 class Request:
     """Class to wrap an ASGI request"""
 
     __slots__ = (
-        'app', 'raw_request', 'data', '_headers',
+        'app', 'raw_request', '_data', '_headers',
+        '_path', '_method', '_scheme',
         '_body', '_body_channel', '_query_args',
         '_form_values', '_form_files', '_form_parsed',
         '_cookies', )
@@ -39,7 +68,12 @@ class Request:
     def __init__(self, app: 'owlbear.app.Owlbear', raw_request: dict, body_channel=None):
         self.app = app
         self.raw_request = raw_request
-        self.data = RequestData()
+        self._data = None
+        rr_get = raw_request.get
+        self._path = rr_get(_KEY_PATH)
+        method = rr_get(_KEY_METHOD)
+        self._method = _METHODS.get(method) or method.upper()
+        self._scheme = rr_get(_KEY_SCHEME)
         self._headers: dict = None
         self._body_channel = body_channel
         self._body = None
@@ -52,72 +86,111 @@ class Request:
     def __str__(self):
         return f"{self.method} {self.path}"
 
+    @property
+    def data(self) -> RequestData:
+        """Return the free-form data container, creating it on first use"""
+        if self._data is None:
+            self._data = RequestData()
+
+        return self._data
+
     @property
     def path(self) -> str:
         """Return the request uri_path"""
-        return self.raw_request.get('path')
+        return self._path
 
     @property
     def query_string(self) -> str:
         """Return the request query string"""
-        return self.raw_request.get('query_string').decode()
+        return self.raw_request.get(_KEY_QUERY_STRING).decode()
 
     @staticmethod
-    def _fix_query_args(query_args):
-        for key in query_args.keys():
-            if not key.endswith("[]"):
-                if len(query_args[key]) == 1:
-                    query_args[key] = query_args[key][0]
-                elif len(query_args[key]) == 0:
-                    query_args[key] = ''
+    def _parse_query_string(qs: str) -> dict:
+        """Parse a query string into a dict in one pass
+
+        Keys ending in "[]" always map to lists; other keys map to a
+        scalar unless they repeat, in which case they map to a list.
+        """
+        parsed = {}
+        for key, val in urllib.parse.parse_qsl(qs, keep_blank_values=True):
+            if key.endswith("[]"):
+                if key in parsed:
+                    parsed[key].append(val)
+                else:
+                    parsed[key] = [val]
+            elif key in parsed:
+                prev = parsed[key]
+                if isinstance(prev, list):
+                    prev.append(val)
+                else:
+                    parsed[key] = [prev, val]
+            else:
+                parsed[key] = val
+
+        return parsed
 
     @property
     def query_args(self) -> dict:
         """Return the parsed query string args"""
         if self._query_args is None:
-            if self.query_string is not None:
-                self._query_args = urllib.parse.parse_qs(self.query_string, keep_blank_values=True)
+            qs = self.query_string
+            if qs is not None:
+                if len(qs) <= _QS_CACHE_MAX_LEN:
+                    self._query_args = {
+                        key: list(val) if isinstance(val, tuple) else val
+                        for key, val in _parse_query_string_cached(qs)
+                    }
+                else:
+                    self._query_args = self._parse_query_string(qs)
             else:
                 self._query_args = {}
 
-            self._fix_query_args(self._query_args)
-
         return self._query_args
 
     @property
     def cookies(self) -> dict:
         """Return cookie values"""
         if self._cookies is None:
-            self._cookies = {}
+            self._cookies = cookies = {}
             cookie_header = self.headers.get('cookie')
             if cookie_header:
-                cookie_parser = http.cookies.SimpleCookie(cookie_header)
-                for key, morsel in cookie_parser.items():
-                    self._cookies[key] = morsel.value
+                # SimpleCookie builds a Morsel (and re-runs its validation
+                # regex) per cookie just to hand us .value; a split-based
+                # parse gets the same name -> value mapping far cheaper
+                for pair in cookie_header.split(';'):
+                    key, sep, val = pair.strip().partition('=')
+                    if not sep:
+                        continue
+
+                    cookies[key] = urllib.parse.unquote(val.strip('"'))
 
         return self._cookies
 
     @staticmethod
     def _header_unquote(val, filename=False):
-        if val[0] == val[-1] == '"':
-            val = val[1:-1]
-            if val[1:3] == ':\\' or val[:2] == '\\\\':
-                val = val.split('\\')[-1]  # fix ie6 bug: full path --> filename
-            return val.replace('\\\\', '\\').replace('\\"', '"')
+        if val[0] != '"' or val[-1] != '"':
+            return val
+
+        val = val[1:-1]
+        if val[1:3] == ':\\' or val[:2] == '\\\\':
+            val = val.split('\\')[-1]  # fix ie6 bug: full path --> filename
 
-        return val
+        return val.replace('\\\\', '\\').replace('\\"', '"')
 
     @classmethod
     def _parse_options_header(cls, header: str, options=None) -> Tuple[str, dict]:
-        if ';' not in header:
+        sep = header.find(';')
+        if sep < 0:
             return header.lower().strip(), {}
 
-        ctype, tail = header.split(';', 1)
+        ctype = header[:sep]
         options = options or {}
 
-        for match in _re_option.finditer(tail):
-            key = match.group(1).lower()
-            value = cls._header_unquote(match.group(2), key=='filename')
+        # scanning from sep avoids slicing the tail into a new string; the
+        # leading (?:;|^) of the pattern matches the ';' at sep
+        for match in _re_option_finditer(header, sep):
+            key = match[1].lower()
+            value = cls._header_unquote(match[2], key=='filename')
             options[key] = value
 
         return ctype, options
@@ -158,8 +231,7 @@ class Request:
                               'application/x-url-encoded'):
 
             form_data_raw = await self.read_body(encoding=charset)
-            form_data = urllib.parse.parse_qs(form_data_raw, keep_blank_values=True)
-            self._fix_query_args(form_data)
+            form_data = self._parse_query_string(form_data_raw)
         else:
             raise FormDataError("Unsupported content type.")
 
@@ -182,35 +254,79 @@ class Request:
     @property
     def scheme(self) -> str:
         """Return the request scheme"""
-        return self.raw_request.get('scheme')
+        return self._scheme
 
     @property
     def method(self) -> str:
         """Return the request verb"""
-        return self.raw_request.get('method').upper()
+        return self._method
 
     @property
     def headers(self) -> dict:
         """Return the request headers"""
         if self._headers is None:
-            self._headers = {}
-            for header_name, header_val in self.raw_request.get('headers', []):
-                header_name = header_name.decode('ascii').lower()
-                header_val = header_val.decode('ascii')
-                self._headers[header_name] = header_val
+            self._headers = headers = {}
+            setitem = headers.__setitem__
+            for header_name, header_val in self.raw_request.get(_KEY_HEADERS, ()):
+                # latin-1 is the ASCII superset HTTP allows, so values with
+                # high bytes (e.g. in cookies) decode without a failure branch
+                setitem(header_name.decode('ascii').lower(), header_val.decode('latin-1'))
 
         return self._headers
 
     async def read_body(self, encoding=None):
         """Read the request body, if there is one"""
         if self._body is None:
-            self._body = self.raw_request.get('body', b'')
-            if self._body_channel:
-                while True:
-                    chunk = await self._body_channel.receive()
-                    self._body += chunk['content']
-                    if not chunk.get('more_content'):
-                        break
+            body = self.raw_request.get(_KEY_BODY, b'')
+            if not self._body_channel:
+                self._body = body
+            else:
+                try:
+                    content_length = int(self.headers.get('content-length'))
+                except (TypeError, ValueError):
+                    content_length = -1
+
+                if content_length > len(body):
+                    # allocate the declared size once and memcpy chunks into
+                    # place, so streaming never reallocates the buffer
+                    buf = bytearray(content_length)
+                    view = memoryview(buf)
+                    offset = len(body)
+                    view[:offset] = body
+                    overflowed = False
+                    while True:
+                        chunk = await self._body_channel.receive()
+                        content = chunk['content']
+                        if overflowed:
+                            buf.extend(content)
+                        else:
+                            end = offset + len(content)
+                            if end <= content_length:
+                                view[offset:end] = content
+                                offset = end
+                            else:
+                                # peer sent more than it declared; grow instead
+                                view.release()
+                                del buf[offset:]
+                                buf.extend(content)
+                                overflowed = True
+
+                        if not chunk.get('more_content'):
+                            break
+
+                    if not overflowed:
+                        view.release()
+                        if offset < content_length:
+                            del buf[offset:]
+                else:
+                    buf = bytearray(body)
+                    while True:
+                        chunk = await self._body_channel.receive()
+                        buf.extend(chunk['content'])
+                        if not chunk.get('more_content'):
+                            break
+
+                self._body = bytes(buf)
 
         if encoding:
             return self._body.decode(encoding)
@@ -1,42 +1,93 @@
 # -*- coding: utf-8 -*-
 """Classes to handle composing and sending an ASGI response"""
-from collections import defaultdict
 from datetime import datetime
-import http.cookies
-from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+import functools
+from typing import Dict, List, Optional, Tuple, Union
 
 try:
-    import ujson as json
+    import orjson
+
+    _json_dumps = orjson.dumps
 except ImportError:
-    import json
-
-
-class Cookie(NamedTuple):
-    """Represents a cookie"""
-    name: str
-    value: str
-    expires: Optional[datetime] = None
-    max_age: Optional[int] = None
-    domain: Optional[str] = None
-    path: Optional[str] = "/"
-    secure: bool = True
-    http_only: bool = True
-    same_site: Optional[str] = "Strict"  # TODO: support this
-
-    def load_into_parser(self, cookie_parser: http.cookies.BaseCookie):
-        cookie_parser[self.name] = self.value
+    try:
+        import ujson
+
+        _json_dumps = ujson.dumps
+    except ImportError:
+        import json
+
+        # bind the encoder once: compact separators, and skip the
+        # ASCII-escape pass since set_content encodes utf-8 anyway
+        _json_dumps = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = (None, "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _http_date(dt: datetime) -> str:
+    """Format a datetime as an RFC 1123 date (e.g. for cookie Expires)
+
+    Equivalent to strftime("%a, %d %b %Y %H:%M:%S GMT") but without the
+    locale machinery and format-string parsing.
+    """
+    return (
+        f"{_WEEKDAYS[dt.weekday()]}, {dt.day:02d} {_MONTHS[dt.month]} {dt.year:04d} "
+        f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} GMT"
+    )
+
+
+class Cookie:
+    """Represents a cookie
+
+    Cookies are set once and may be serialized on every header build of
+    a response, so the Set-Cookie bytes are computed at construction.
+    """
+
+    __slots__ = ('name', 'value', 'expires', 'max_age', 'domain', 'path',
+                 'secure', 'http_only', 'same_site', '_formatted_bytes', )
+
+    def __init__(self,
+                 name: str,
+                 value: str,
+                 expires: Optional[datetime]=None,
+                 max_age: Optional[int]=None,
+                 domain: Optional[str]=None,
+                 path: Optional[str]="/",
+                 secure: bool=True,
+                 http_only: bool=True,
+                 same_site: Optional[str]="Strict"):
+        self.name = name
+        self.value = value
+        self.expires = expires
+        self.max_age = max_age
+        self.domain = domain
+        self.path = path
+        self.secure = secure
+        self.http_only = http_only
+        self.same_site = same_site
+        self._formatted_bytes = self.formatted().encode('ascii')
+
+    def formatted(self) -> str:
+        """Serialize to a Set-Cookie header value"""
+        parts = [f"{self.name}={self.value}"]
         if self.expires:
-            cookie_parser[self.name]['expires'] = self.expires.strftime("%a, %d %b %Y %H:%M:%S GMT")
+            parts.append(f"expires={_http_date(self.expires)}")
         if self.path:
-            cookie_parser[self.name]['path'] = self.path
+            parts.append(f"Path={self.path}")
         if self.domain:
-            cookie_parser[self.name]['domain'] = self.domain
+            parts.append(f"Domain={self.domain}")
         if self.max_age:
-            cookie_parser[self.name]['max-age'] = self.max_age
+            parts.append(f"Max-Age={self.max_age}")
         if self.secure:
-            cookie_parser[self.name]['secure'] = self.secure
+            parts.append("Secure")
         if self.http_only:
-            cookie_parser[self.name]['httponly'] = self.http_only
+            parts.append("HttpOnly")
+        if self.same_site is not None:
+            parts.append(f"SameSite={self.same_site}")
+
+        return "; ".join(parts)
 
 
 class ResponseError(Exception):
@@ -44,68 +95,130 @@ class ResponseError(Exception):
     pass
 
 
+def _encode_if_necessary(str_or_bytes: Union[str, bytes], encoding: str='ascii') -> bytes:
+    # exact type check: this is called per header value and the common
+    # case is a plain str, where isinstance would still walk the MRO
+    if type(str_or_bytes) is bytes:
+        return str_or_bytes
+
+    return str_or_bytes.encode(encoding)
+
+
+_ASCII_LOWER_TBL = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+
+
+# header names come from a small recurring vocabulary, so the lowercased
+# ASCII form is shared across all responses after the first encounter;
+# this doubles as the interning table for _headers keys (bytes hash
+# caching makes repeated dict probes on the shared object cheap)
+@functools.lru_cache(maxsize=256)
+def _encode_header_name(header_name: str) -> bytes:
+    # encode then translate: both run as single C loops, skipping the
+    # Unicode-aware str.lower path entirely
+    return header_name.encode('ascii').translate(_ASCII_LOWER_TBL)
+
+
+# canonical bytes for the header names owlbear itself constructs
+_H_CONTENT_TYPE = b'content-type'
+_H_SET_COOKIE = b'set-cookie'
+_H_LOCATION = b'location'
+
+# response send-progress states
+_STATE_NEW = 0
+_STATE_HEADERS_SENT = 1
+_STATE_DONE = 2
+
+
 class Response:
     """Interface to compose and send an ASGI response"""
 
-    __slots__ = ('_headers', '_content', 'status', '_cookies', 'content_type', '_charset', '_headers_sent', '_done', "_full_response", )
+    __slots__ = ('_headers', '_content', 'status', '_cookies', '_content_type', '_content_type_header', '_charset', '_state', "_full_response", '_encoded_headers', )
 
     def __init__(self):
         self.status = 200
-        self.content_type = 'text/plain'
-        self._headers = defaultdict(list)
+        self._charset = None
+        # assign the content-type default directly rather than through the
+        # property setter: the caches it would invalidate are initialized
+        # just below, so the setter's extra work is pure overhead here
+        self._content_type = 'text/plain'
+        self._content_type_header = None
+        # name -> value for the common single-value case, promoted to
+        # name -> [value, ...] on a repeated add
+        self._headers = {}
         self._cookies = {}
         self._content = b''
-        self._charset = None
-        self._headers_sent = False
-        self._done = False
+        self._state = _STATE_NEW
         self._full_response = None
+        self._encoded_headers = None
 
-    @staticmethod
-    def _encode_if_necessary(str_or_bytes: Union[str, bytes], encoding: str='ascii') -> bytes:
-        if isinstance(str_or_bytes, bytes):
-            return str_or_bytes
-        else:
-            return str_or_bytes.encode(encoding)
+    @property
+    def content_type(self) -> str:
+        """Return the response content type"""
+        return self._content_type
+
+    @content_type.setter
+    def content_type(self, value: str):
+        self._content_type = value
+        self._content_type_header = None
+        self._invalidate_header_cache()
 
     def _form_full_response(self) -> dict:
         if self._full_response is None:
-            resp = self._form_header_response()
-            resp.update(self._form_content_response(self._content), done=True)
-
-            self._full_response = resp
+            self._full_response = {
+                'status': self.status,
+                'headers': self._encoded_header_list(),
+                'content': self._content,
+                'more_content': False,
+                'done': True,
+            }
 
         return self._full_response
 
-    def _form_header_response(self):
-        headers = []
+    def _encoded_header_list(self) -> List[Tuple[bytes, bytes]]:
+        """Return the encoded (name, value) header pairs
+
+        The returned list and its tuples are shared across every message
+        built from this response; ASGI servers treat 'headers' as
+        read-only, so no defensive copy is made.
+        """
+        if self._encoded_headers is not None:
+            return self._encoded_headers
 
+        # names and values were already lowercased and encoded by add_header
+        headers = []
         for header_name, header_vals in self._headers.items():
-            header_name = header_name.lower().encode('ascii')
-            for header_val in header_vals:
-                header_val = self._encode_if_necessary(header_val, 'ascii')
+            if type(header_vals) is list:
+                for header_val in header_vals:
+                    headers.append((header_name, header_val))
+            else:
+                headers.append((header_name, header_vals))
 
-                headers.append((header_name, header_val))
+        for cookie in self._cookies.values():
+            headers.append((_H_SET_COOKIE, cookie._formatted_bytes))
 
-        cookie_parser = http.cookies.SimpleCookie()
-        for cookie_name, cookie in self._cookies.items():
-            cookie.load_into_parser(cookie_parser)
+        content_type_header = self._content_type_header
+        if content_type_header is None:
+            if self._charset:
+                # one join, one allocation, instead of chained concats
+                content_type_val = b''.join((
+                    _encode_if_necessary(self._content_type),
+                    b'; charset=',
+                    _encode_if_necessary(self._charset),
+                ))
+            else:
+                content_type_val = _encode_if_necessary(self._content_type)
 
-        for cookie_name, morsel in cookie_parser.items():
-            cookie_val = morsel.OutputString()
-            if self._cookies[cookie_name].same_site is not None:
-                cookie_val += "; SameSite={}".format(self._cookies[cookie_name].same_site)
+            content_type_header = self._content_type_header = (_H_CONTENT_TYPE, content_type_val)
 
-            headers.append((b'set-cookie', self._encode_if_necessary(cookie_val)))
+        headers.append(content_type_header)
 
-        content_type_val = self._encode_if_necessary(self.content_type)
-        if self._charset:
-            content_type_val += b"; charset=" + self._encode_if_necessary(self._charset)
-        headers.append((b'content-type', content_type_val))
+        self._encoded_headers = headers
 
-        return {
-            'status': self.status,
-            'headers': headers
-        }
+        return headers
+
+    def _invalidate_header_cache(self):
+        self._encoded_headers = None
+        self._full_response = None
 
     @staticmethod
     def _form_content_response(content: bytes, done: bool=True) -> dict:
@@ -117,6 +230,7 @@ class Response:
     def set_cookie(self, cookie: Cookie):
         """Add a cookie to the list that will be returned in the response"""
         self._cookies[cookie.name] = cookie
+        self._invalidate_header_cache()
 
     def set_content(self, content: Union[str, bytes], encoding: Optional[Union[str, bytes]]='utf-8'):
         """Set the response content"""
@@ -127,43 +241,74 @@ class Response:
             self._content = content
 
         self._charset = encoding
+        self._content_type_header = None
+        self._invalidate_header_cache()
 
     def add_header(self, header_name: str, header_val: str):
         """Add a header to the response"""
-        self._headers[header_name.lower()].append(header_val)
+        key = _encode_header_name(header_name)
+        val = _encode_if_necessary(header_val)
+
+        current = self._headers.get(key)
+        if current is None:
+            self._headers[key] = val
+        elif type(current) is list:
+            current.append(val)
+        else:
+            self._headers[key] = [current, val]
+
+        self._invalidate_header_cache()
 
     def clear_headers(self, header_name: Optional[str]):
         """Clear one or all headers"""
         if header_name is not None:
-            self._headers[header_name.lower()] = []
+            self._headers.pop(_encode_header_name(header_name), None)
         else:
-            self._headers = defaultdict(list)
+            self._headers = {}
+
+        self._invalidate_header_cache()
 
     async def stream_to(self, channel, content: bytes, done: bool=False):
         """Stream the response to an ASGI channel"""
-        if self._done:
+        if self._state == _STATE_DONE:
             raise ResponseError("A full response has already been sent.")
 
         resp = self._form_content_response(content, done=done)
-        if not self._headers_sent:
-            resp.update(self._form_header_response())
+        if self._state == _STATE_NEW:
+            resp['status'] = self.status
+            resp['headers'] = self._encoded_header_list()
+            self._state = _STATE_HEADERS_SENT
 
         await channel.send(resp)
         if done:
-            self._done = True
+            self._state = _STATE_DONE
 
-    async def send_to(self, channel):
-        """Send the response, in full, to an ASGI channel"""
-        if self._headers_sent:
-            raise ResponseError("A set of response headers has already been sent.")
+    def send_to(self, channel):
+        """Send the response, in full, to an ASGI channel
 
-        if self._done:
-            raise ResponseError("A full response has already been sent.")
+        Returns the channel's own send awaitable so that awaiting the
+        result suspends exactly once, without an extra coroutine frame
+        in between.
+        """
+        if self._state:
+            if self._state == _STATE_DONE:
+                raise ResponseError("A full response has already been sent.")
+
+            raise ResponseError("A set of response headers has already been sent.")
 
         resp = self._form_full_response()
-        self._headers_sent = True
-        self._done = True
-        await channel.send(resp)
+        self._state = _STATE_DONE
+        return channel.send(resp)
+
+
+def _apply_headers(resp: Response, headers: Optional[Union[Dict[str, str], List[Tuple[str, str]]]]):
+    """Apply a headers dict or pair list to a response"""
+    if not headers:
+        return
+
+    add_header = resp.add_header
+    for hname, hval in headers.items() if isinstance(headers, dict) else headers:
+        add_header(hname, hval)
 
 
 def text_response(content: str, status: int=200, headers: Optional[Union[Dict[str, str], List[Tuple[str, str]]]]=None) -> Response:
@@ -172,14 +317,7 @@ def text_response(content: str, status: int=200, headers: Optional[Union[Dict[st
     resp.status = status
     resp.content_type = "text/plain"
     resp.set_content(content)
-
-    if headers:
-        if isinstance(headers, dict):
-            for hname, hval in headers.items():
-                resp.add_header(hname, hval)
-        else:
-            for hname, hval in headers:
-                resp.add_header(hname, hval)
+    _apply_headers(resp, headers)
 
     return resp
 
@@ -190,14 +328,7 @@ def html_response(content: str, status: int=200, headers: Optional[Union[Dict[st
     resp.status = status
     resp.content_type = "text/html"
     resp.set_content(content)
-
-    if headers:
-        if isinstance(headers, dict):
-            for hname, hval in headers.items():
-                resp.add_header(hname, hval)
-        else:
-            for hname, hval in headers:
-                resp.add_header(hname, hval)
+    _apply_headers(resp, headers)
 
     return resp
 
@@ -207,15 +338,8 @@ def json_response(content: dict, status: int=200, headers: Optional[Union[Dict[s
     resp = Response()
     resp.status = status
     resp.content_type = "application/json"
-    resp.set_content(json.dumps(content))
-
-    if headers:
-        if isinstance(headers, dict):
-            for hname, hval in headers.items():
-                resp.add_header(hname, hval)
-        else:
-            for hname, hval in headers:
-                resp.add_header(hname, hval)
+    resp.set_content(_json_dumps(content))
+    _apply_headers(resp, headers)
 
     return resp
 
@@ -229,15 +353,9 @@ def redirect_response(location: str, permanent: bool=False, headers: Optional[Un
     else:
         resp.status = 302
 
-    resp.set_content("Moved to {}".format(location))
-    resp.add_header("location", location)
-
-    if headers:
-        if isinstance(headers, dict):
-            for hname, hval in headers.items():
-                resp.add_header(hname, hval)
-        else:
-            for hname, hval in headers:
-                resp.add_header(hname, hval)
+    # redirects don't need a body; writing the pre-encoded location
+    # directly skips the per-redirect content format/encode passes
+    resp._headers[_H_LOCATION] = location.encode('ascii')
+    _apply_headers(resp, headers)
 
     return resp
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 """Classes to handle request routing"""
+import collections
 import functools
 import logging
 import re
+import sys
+import types
 from typing import (
     Any, Callable, Dict,
-    List, Mapping, MutableMapping, Optional,
+    Iterator, List, Mapping, MutableMapping, Optional,
     Set, Tuple, Union,
 )
 
@@ -48,9 +51,64 @@ _STAR_TYPES = {
     'int': int,
     'str': str,
 }
-_URI_PARAMETER_RE = re.compile(
-    r"^<([a-zA-Z_][a-zA-Z0-9_]*)?(?::\s*([^>]*))?>$"
-)
+
+# returned (instead of raising) by the tree walk on a miss, so that a
+# 404 costs an identity check rather than exception unwinding
+_NOT_FOUND = object()
+
+# both spellings of the standard verbs map to the canonical interned
+# form, so dispatch normalizes a method with one dict get instead of an
+# .upper() allocation (the Request already hands over the upper form)
+_METHOD_CANONICAL = {m: m for m in ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')}
+_METHOD_CANONICAL.update({m.lower(): canonical for m, canonical in tuple(_METHOD_CANONICAL.items())})
+
+# bound on the per-router (method, path) lookup cache; parameterized
+# paths make the key space unbounded, so oldest entries are evicted
+_LOOKUP_CACHE_MAX = 1024
+
+# shared read-only result for routes with no path parameters, so the
+# majority of lookups allocate no args dict at all
+_EMPTY_ARGS = types.MappingProxyType({})
+
+# shared by every node with no static children / no methods — i.e. most
+# leaves — so they don't each carry two empty hash tables. Writers must
+# swap in a private dict before the first insert (copy-on-write).
+_EMPTY_DICT: dict = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_uri_parameter(key: str) -> Union[Tuple[str, str], Tuple[None, None]]:
+    """Parse a '<name: type>' uri segment into its name and type name
+
+    Cached per unique segment string so that the same parameter segment
+    appearing in many routes is only parsed once. The grammar is simple
+    enough that partition/isidentifier (both C loops) cover it without
+    a regex.
+
+    Args:
+        key ():
+
+    Returns:
+
+    """
+    # almost every segment is a static string; bail on the delimiter
+    # check alone for those
+    if not key or key[0] != '<' or key[-1] != '>':
+        return None, None
+
+    star_name, sep, star_type_name = key[1:-1].partition(':')
+    star_name = star_name.strip()
+    if star_name and not star_name.isidentifier():
+        return None, None
+
+    if not star_name:
+        raise BadRouteParameter("Route parameter definition must have a non-empty name.")
+
+    star_type_name = star_type_name.strip() or 'str' if sep else 'str'
+    if star_type_name not in _STAR_TYPES:
+        raise BadRouteParameter(f"Route parameter type '{star_type_name}' was not recognized")
+
+    return star_name, star_type_name
 
 
 def _get_star_attrs(key: str,
@@ -65,30 +123,41 @@ def _get_star_attrs(key: str,
     Returns:
 
     """
-    matches = _URI_PARAMETER_RE.match(key)
-    if matches:
-        star_name = (matches.group(1) or '').strip()
-        if not star_name:  # pragma: no cover
-            raise BadRouteParameter("Route parameter definition must have a non-empty name.")
-
+    star_name, star_type = _parse_uri_parameter(key)
+    if star_name is not None:
         if star_name in parent_parameter_names:
             raise BadRouteParameter("Route parameter has a conflicting name.")
 
-        star_type_name = matches.group(2) or 'str'
-        if star_type_name not in _STAR_TYPES:
-            raise BadRouteParameter(f"Route parameter type '{star_type_name}' was not recognized")
-
-        star_type = star_type_name
         parent_parameter_names.append(star_name)
-    else:
-        star_name = None
-        star_type = None
 
     return star_name, star_type
 
 
-def _make_uri_parts(path: str) -> List[str]:
+def _wrap_middleware(outer: Middleware, inner: Middleware) -> Middleware:
+    """Compose two middlewares into one, outer around inner
+
+    Args:
+        outer ():
+        inner ():
+
+    Returns:
+
     """
+    async def wrapped(request, next_handler):
+        async def call_inner(req):
+            return await inner(req, next_handler)
+
+        return await outer(request, call_inner)
+
+    return wrapped
+
+
+@functools.lru_cache(maxsize=1024)
+def _make_uri_parts(path: str) -> Tuple[str, ...]:
+    """Split a path into its uri segments
+
+    Cached on the raw path since the popular paths of a running app
+    recur constantly; the tuple result is immutable and safe to share.
 
     Args:
         path ():
@@ -97,14 +166,18 @@ def _make_uri_parts(path: str) -> List[str]:
 
     """
     path = path.strip("/")
-    if path != "":
-        path = f"/{path}"
+    if not path:
+        return ('', )
 
-    return path.split("/")
+    # prepending the empty root segment directly skips re-joining the
+    # path just to split it again; interned segments make the trie's
+    # dict probes pointer-equality fastpaths once the registration side
+    # interns its keys too
+    return ('', ) + tuple(map(sys.intern, path.split("/")))
 
 
 def print_route_tree(route_tree: 'RouteTree', indent: str=""):
-    """
+    """Write the tree structure to stdout in one buffered write
 
     Args:
         route_tree ():
@@ -113,26 +186,40 @@ def print_route_tree(route_tree: 'RouteTree', indent: str=""):
     Returns:
 
     """
-    print(indent, "-", repr(route_tree.prefix), f"{', '.join(route_tree.methods.keys())}")
-    indent = indent + "  "
+    buf = []
+    stack = [(route_tree, indent)]
+    while stack:
+        node, node_indent = stack.pop()
+        buf.append(f"{node_indent} - {node.prefix!r} {', '.join(node.methods.keys())}\n")
+
+        child_indent = node_indent + "  "
+        for _key, child in reversed(list(node.iter_children())):
+            stack.append((child, child_indent))
 
-    for key, child in route_tree.children.items():
-        print_route_tree(child, indent)
+    sys.stdout.write("".join(buf))
 
 
 class RouteTree:
-    """Manages the routes and methods in a tree-like manner"""
+    """Manages the routes and methods in a tree-like manner
+
+    Children live in dedicated buckets so that dispatch can probe static
+    segments, the parameter child, and the catch-all child separately
+    instead of testing sentinel keys ('*', '__static__') in one dict.
+    """
     prefix: str
     children: MutableMapping[str, 'RouteTree']
     methods: MutableMapping[str, RequestHandler]
 
-    __slots__ = ('prefix', 'children', 'methods', 'star_name', 'star_type', 'logger', )
+    __slots__ = ('prefix', 'prefix_stripped', 'children', 'star_child', 'catch_all_child', 'methods', 'star_name', 'star_type', 'star_type_fn', )
+
+    # shared across all nodes: a per-node logger slot is 8 bytes times
+    # every node in every mounted sub-app, for a debug-only facility
+    logger = setup_logger("owlbear.routetree")
 
     def __init__(self,
                  prefix: str,
                  star_name: Optional[str]=None,
-                 star_type: Optional[str]=None,
-                 *, logger: Optional[logging.Logger]=None):
+                 star_type: Optional[str]=None):
         """
 
         Args:
@@ -140,24 +227,36 @@ class RouteTree:
             star_name ():
             star_type ():
         """
-        self.logger = logger or setup_logger("owlbear.routetree")
-
         self.prefix = prefix
-        self.children = {}
-        self.methods = {}
-
-        if prefix.endswith("/*"):
-            assert star_name is not None
-            assert star_type is not None
-        else:
-            assert star_name is None
-            assert star_type is None
+        # the no-trailing-slash form is needed every time a child prefix
+        # or not-found message is built, so strip it exactly once
+        self.prefix_stripped = prefix.rstrip("/")
+        # most nodes never get static children or methods of their own,
+        # so both buckets start as the shared empty dict and are only
+        # promoted to a private dict on the first insert
+        self.children = _EMPTY_DICT
+        self.star_child: Optional['RouteTree'] = None
+        self.catch_all_child: Optional['RouteTree'] = None
+        self.methods = _EMPTY_DICT
+
+        # consistency checks only; _add_child (the sole internal caller)
+        # already derives these together, so skip the endswith scans
+        # entirely under -O
+        if __debug__:
+            if prefix.endswith("/*"):
+                assert star_name is not None
+                assert star_type is not None
+            else:
+                assert star_name is None
+                assert star_type is None
 
         self.star_name = star_name
         self.star_type = star_type
+        # resolved once here so the per-request parse skips the dict get
+        self.star_type_fn = _STAR_TYPES[star_type] if star_type else None
 
     def reset_prefix(self, new_prefix: str):
-        """
+        """Rewrite the prefixes of this subtree under a new base
 
         Args:
             new_prefix ():
@@ -165,18 +264,27 @@ class RouteTree:
         Returns:
 
         """
-        self.logger.debug("Resetting prefix", old_prefix=self.prefix, new_prefix=new_prefix)
+        stack = [(self, new_prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            if node.prefix != "":
+                node.prefix = node.prefix_stripped = prefix.rstrip("/")
 
-        if self.prefix != "":
-            self.prefix = new_prefix.rstrip("/")
+            for key, rtree in node.iter_children():
+                stack.append((rtree, f"{prefix}/{key}".rstrip("/")))
 
-        for key, rtree in self.children.items():
-            rtree.reset_prefix(f"{new_prefix}/{key}".rstrip("/"))
+    def iter_children(self):
+        """Yield (key, child) pairs across all child buckets"""
+        yield from self.children.items()
+        if self.star_child is not None:
+            yield '*', self.star_child
+        if self.catch_all_child is not None:
+            yield '__static__', self.catch_all_child
 
     def _add_child(self,
                    key: str,
                    star_name: Optional[str],
-                   star_type: Optional[str]):
+                   star_type: Optional[str]) -> 'RouteTree':
         """
 
         Args:
@@ -189,15 +297,28 @@ class RouteTree:
         """
         self.logger.debug("Adding child", key=key, star_name=star_name, star_type=star_type)
 
-        child_prefix = f"{self.prefix.rstrip('/')}/{key}"
-        self.children[key] = RouteTree(child_prefix, star_name=star_name, star_type=star_type, logger=self.logger)
+        child_prefix = f"{self.prefix_stripped}/{key}"
+        child = RouteTree(child_prefix, star_name=star_name, star_type=star_type)
+
+        if star_name is not None:
+            self.star_child = child
+        elif key == '__static__':
+            self.catch_all_child = child
+        else:
+            if self.children is _EMPTY_DICT:
+                self.children = {}
+
+            self.children[sys.intern(key)] = child
+
+        return child
 
     def add_handler(self,
-                    uri_parts: List[str],
+                    uri_parts: Tuple[str, ...],
                     handler: RequestHandler,
                     methods: Methods=('GET', ),
                     parent_parameter_names: Optional[List[str]]=None,
-                    allow_stars: bool=True) \
+                    allow_stars: bool=True,
+                    idx: int=0) \
             -> Dict[Tuple[str, str], Tuple[str, Set[str]]]:
         """
 
@@ -207,27 +328,25 @@ class RouteTree:
             methods ():
             parent_parameter_names ():
             allow_stars ():
+            idx ():
 
         Returns:
 
         """
 
-        self.logger.debug("Adding handler", uri_parts=uri_parts, handler=handler, methods=methods, parent_parameter_names=parent_parameter_names, allow_stars=allow_stars)
-
         if not methods:
             raise ValueError("No route methods were provided.")
 
-        if not uri_parts:
+        if idx == len(uri_parts):
+            if self.methods is _EMPTY_DICT:
+                self.methods = {}
+
             updates = {}
             for method in methods:
-                method = method.upper()
-                if self.methods.get(method):
-                    raise ConflictingRoutes("Trying to add route '{method} {path}' -> {handler} conflicts with existing handler {old_handler}".format(
-                        method=method,
-                        path=self.prefix,
-                        handler=handler,
-                        old_handler=self.methods.get(method),
-                    ))
+                method = sys.intern(method.upper())
+                existing = self.methods.get(method)
+                if existing is not None:
+                    raise ConflictingRoutes(f"Trying to add route '{method} {self.prefix}' -> {handler} conflicts with existing handler {existing}")
 
                 self.methods[method] = handler
                 updates[(handler.__name__, method)] = ('', set())
@@ -235,7 +354,7 @@ class RouteTree:
             return updates
 
         else:
-            key, *rest = uri_parts
+            key = uri_parts[idx]
 
             if parent_parameter_names is None:
                 parent_parameter_names = []
@@ -247,18 +366,21 @@ class RouteTree:
 
             if star_name:
                 key = '*'
+                key_route = self.star_child
+            elif key == '__static__':
+                key_route = self.catch_all_child
+            else:
+                key_route = self.children.get(key)
 
-            if key not in self.children:
-                self._add_child(key, star_name, star_type)
-
-            key_route = self.children[key]
+            if key_route is None:
+                key_route = self._add_child(key, star_name, star_type)
 
             if star_name != key_route.star_name:
                 raise BadRouteParameter("Route parameter has a conflicting name.")
             if star_type != key_route.star_type:
                 raise BadRouteParameter("Route parameter has a conflicting type.")
 
-            updates = key_route.add_handler(rest, handler=handler, methods=methods, parent_parameter_names=parent_parameter_names, allow_stars=allow_stars)
+            updates = key_route.add_handler(uri_parts, handler=handler, methods=methods, parent_parameter_names=parent_parameter_names, allow_stars=allow_stars, idx=idx + 1)
             for k, (path, req_args) in updates.items():
                 if star_name:
                     req_args.add(star_name)
@@ -281,20 +403,62 @@ class RouteTree:
         Returns:
 
         """
-        if self.star_type is None:  # pragma: no cover
+        star_type_fn = self.star_type_fn
+        if star_type_fn is None:  # pragma: no cover
             return None, None
 
+        # str parameters are an identity conversion; hand the segment
+        # back without the call or the try/except
+        if star_type_fn is str:
+            return self.star_name, last_part
+
+        # the common case — a well-formed int segment — converts without
+        # entering the try/except machinery at all
+        if star_type_fn is int and last_part.isdigit():
+            return self.star_name, int(last_part)
+
         try:
-            return self.star_name, _STAR_TYPES[self.star_type](last_part)
+            return self.star_name, star_type_fn(last_part)
         except Exception:
-            raise ParameterTypeError(f"Paramter value '{last_part}' could not be converted to type {_STAR_TYPES[self.star_type]} for parameter {self.star_name}")
+            raise ParameterTypeError(f"Paramter value '{last_part}' could not be converted to type {star_type_fn} for parameter {self.star_name}")
 
     def get_handler_and_args(self,
                              uri_parts: List[str],
                              method: str,
                              handler_args: Optional[MutableMapping[str, Any]]=None) \
             -> Optional[Tuple[RequestHandler, Mapping[str, Any]]]:
+        """Find the handler for a request, raising RouteNotFound on a miss
+
+        Args:
+            uri_parts ():
+            method ():
+            handler_args ():
+
+        Returns:
+
         """
+        handler, handler_args = self._find(uri_parts, method, handler_args)
+        if handler is _NOT_FOUND:
+            node, i = handler_args
+            raise RouteNotFound(f"Could not find route for '{node.prefix_stripped}/{uri_parts[i]}'")
+
+        return handler, handler_args
+
+    def _find(self,
+              uri_parts: Tuple[str, ...],
+              method: str,
+              handler_args: Optional[MutableMapping[str, Any]]=None) \
+            -> Tuple[Any, Any]:
+        """Walk the tree iteratively to find the handler for a request
+
+        The walk keeps an index into uri_parts instead of recursing with
+        sliced tails, and backtracks through an explicit stack of
+        untried star/catch-all buckets when a static branch dead-ends.
+        A miss returns the _NOT_FOUND sentinel and the dead-end (node,
+        index) — never a raised exception — so callers decide at the
+        boundary whether a miss is exceptional. Parameterless matches
+        share the read-only _EMPTY_ARGS mapping; a real dict is only
+        allocated once the first parameter is captured.
 
         Args:
             uri_parts ():
@@ -304,43 +468,66 @@ class RouteTree:
         Returns:
 
         """
-        self.logger.debug("Finding handler and args for", uri_parts=uri_parts, method=method, handler_args=handler_args)
+        method = _METHOD_CANONICAL.get(method) or method.upper()
+        node = self
+        i = 0
+        n = len(uri_parts)
+        # phase 0: probe the static bucket; 1: the star bucket; 2: the
+        # catch-all bucket. Pending entries are (node, i, phase)
+        # alternatives to resume at if the current branch dead-ends.
+        phase = 0
+        pending = []
 
-        if handler_args is None:
-            handler_args = {}
+        while True:
+            if phase == 0:
+                if i == n:
+                    return node.methods.get(method), handler_args if handler_args is not None else _EMPTY_ARGS
 
-        if not uri_parts:
-            return self.methods.get(method.upper()), handler_args
+                child = node.children.get(uri_parts[i])
+                if child is not None:
+                    if node.star_child is not None or node.catch_all_child is not None:
+                        pending.append((node, i, 1))
 
-        key, *rest = uri_parts
-        if key in self.children:
-            try:
-                return self.children[key].get_handler_and_args(rest, method.upper(), handler_args=handler_args)
-            except RouteNotFound:  # pragma: no cover
-                pass
+                    node = child
+                    i += 1
+                    continue
 
+                phase = 1
 
-        if '*' in self.children:
-            param_name, param_val = self.children['*']._parse_last_uri_part(key)
+            if phase == 1:
+                star_child = node.star_child
+                if star_child is not None:
+                    param_name, param_val = star_child._parse_last_uri_part(uri_parts[i])
+                    if param_name is not None:
+                        if handler_args is None:
+                            handler_args = {}
 
-            if param_name is not None:
-                handler_args[param_name] = param_val
+                        handler_args[param_name] = param_val
 
-            try:
-                return self.children['*'].get_handler_and_args(rest, method, handler_args=handler_args)
-            except RouteNotFound:  # pragma: no cover
-                pass
+                    if node.catch_all_child is not None:
+                        pending.append((node, i, 2))
 
-        if '__static__' in self.children:
-            try:
-                return self.children['__static__'].get_handler_and_args([], method='GET', handler_args=None)
-            except RouteNotFound:  # pragma: no cover
-                pass
+                    node = star_child
+                    i += 1
+                    phase = 0
+                    continue
 
-        raise RouteNotFound(f"Could not find route for '{self.prefix.rstrip('/')}/{key}'")
+                phase = 2
 
-    def list_handlers(self, prefix: str=None) -> List[Tuple[str, str, RequestHandler]]:
-        """
+            if node.catch_all_child is not None:
+                return node.catch_all_child.methods.get('GET'), _EMPTY_ARGS
+
+            if pending:
+                node, i, phase = pending.pop()
+                continue
+
+            return _NOT_FOUND, (node, i)
+
+    def list_handlers(self, prefix: str=None) -> Iterator[Tuple[str, str, RequestHandler]]:
+        """Yield (path, method, handler) triples for this subtree
+
+        A generator so consumers like merge_with stream the routes
+        without an intermediate list of the whole subtree.
 
         Args:
             prefix ():
@@ -351,21 +538,73 @@ class RouteTree:
         if prefix is None:
             prefix = self.prefix.rsplit("/", 1)[0]
 
-        key = self.prefix.split("/")[-1]
-        if key == "*":
-            key = f"<{self.star_name}: {self.star_type}>"
-
-        full_key = f"{prefix.rstrip('/')}/{key}"
-
-        handlers = [
-            (full_key, method, handler)
-            for method, handler in self.methods.items()
-        ]
-
-        for child in self.children.values():
-            handlers.extend(child.list_handlers(prefix=full_key))
-
-        return handlers
+        stack = [(self, prefix.rstrip("/"))]
+        while stack:
+            node, parent_prefix = stack.pop()
+
+            key = node.prefix.rsplit("/", 1)[-1]
+            if key == "*":
+                key = f"<{node.star_name}: {node.star_type}>"
+
+            full_key = f"{parent_prefix}/{key}"
+
+            for method, handler in node.methods.items():
+                yield (full_key, method, handler)
+
+            stripped = full_key.rstrip("/")
+            for _key, child in node.iter_children():
+                stack.append((child, stripped))
+
+    def _graft(self, other: 'RouteTree'):
+        """Splice another tree's nodes into this one in place
+
+        Where this tree has no competing node the other tree's subtree
+        is adopted wholesale (no per-route re-parse or re-insert); only
+        nodes present on both sides are merged. The other tree must
+        already carry its final prefixes (reset_prefix) and should not
+        be mutated afterwards, since its nodes are shared, not copied.
+        """
+        stack = [(self, other)]
+        while stack:
+            dest, src = stack.pop()
+
+            if src.methods and dest.methods is _EMPTY_DICT:
+                dest.methods = {}
+            if src.children and dest.children is _EMPTY_DICT:
+                dest.children = {}
+
+            for method, handler in src.methods.items():
+                existing = dest.methods.get(method)
+                if existing is not None:
+                    raise ConflictingRoutes(f"Trying to add route '{method} {dest.prefix}' -> {handler} conflicts with existing handler {existing}")
+
+                dest.methods[method] = handler
+
+            for key, child in src.children.items():
+                mine = dest.children.get(key)
+                if mine is None:
+                    dest.children[key] = child
+                else:
+                    stack.append((mine, child))
+
+            if src.star_child is not None:
+                mine = dest.star_child
+                if mine is None:
+                    dest.star_child = src.star_child
+                else:
+                    if mine.star_name != src.star_child.star_name:
+                        raise BadRouteParameter("Route parameter has a conflicting name.")
+                    if mine.star_type != src.star_child.star_type:
+                        raise BadRouteParameter("Route parameter has a conflicting type.")
+
+                    stack.append((mine, src.star_child))
+
+            if src.catch_all_child is not None:
+                mine = dest.catch_all_child
+                if mine is None:
+                    dest.catch_all_child = src.catch_all_child
+                else:
+                    stack.append((mine, src.catch_all_child))
 
     def merge_with(self,
                    other: 'RouteTree') \
@@ -389,16 +628,103 @@ class RouteTree:
 
 class Router:
     """The programmer-facing router"""
-    __slots__ = ('tree', 'middleware', 'handler_to_url', 'logger', )
+    __slots__ = ('tree', 'middleware', '_middleware_chain', 'handler_to_url', 'logger', '_compiled', '_match_table', '_dirty', '_lookup_cache', '_entry_cache', )
 
     def __init__(self, *, logger: Optional[logging.Logger]=None):
         """
 
         """
         self.logger = logger or setup_logger("owlbear.router")
-        self.tree = RouteTree("", logger=self.logger)
+        self.tree = RouteTree("")
         self.middleware = []
+        self._middleware_chain = None
         self.handler_to_url = {}
+        self._compiled = None
+        self._match_table = None
+        self._dirty = False
+        self._lookup_cache = collections.OrderedDict()
+        self._entry_cache = {}
+
+    def finalize(self):
+        """Compile the registered routes into a single dispatch regex
+
+        All non-catch-all routes are folded into one alternation, one
+        branch per path, with an empty marker group closing each branch;
+        which marker matched (match.lastindex) indexes a table of
+        (methods, parameter specs) so dispatch becomes a single C-level
+        match plus one list index. Catch-all (static file) routes and
+        anything the regex misses still fall back to the tree walk.
+        Registering further routes un-finalizes the router.
+        """
+        # path -> ({method: handler}, [(param name, coerce fn), ...])
+        routes: Dict[str, Tuple[Dict[str, RequestHandler], list]] = {}
+        for path, method, handler in self.tree.list_handlers():
+            if '__static__' in path.split('/'):
+                continue
+
+            route = routes.get(path)
+            if route is None:
+                routes[path] = route = ({}, None)
+
+            route[0][method] = handler
+
+        # order the branches the way the tree walks: compared segment by
+        # segment, a static segment outranks a parameter capture, so for
+        # overlapping routes the first branch to match is the one the
+        # tree's static-bucket-before-star walk would pick (a total
+        # parameter count can't express this — '/a/<x>' must beat
+        # '/<y>/b' even though both have one parameter)
+        ordered = sorted(
+            routes,
+            key=lambda p: tuple(
+                (_parse_uri_parameter(segment)[0] is not None, segment)
+                for segment in p.split('/')
+            ),
+        )
+
+        match_table = [None]  # group numbers are 1-based
+        branches = []
+        group_count = 0
+        for path in ordered:
+            segment_patterns = []
+            params = []
+            for segment in path.split('/'):
+                star_name, star_type = _parse_uri_parameter(segment)
+                if star_name is None:
+                    segment_patterns.append(re.escape(segment))
+                else:
+                    segment_patterns.append(r'(-?\d+)' if star_type == 'int' else r'([^/]+)')
+                    params.append((star_name, _STAR_TYPES[star_type]))
+
+            branches.append('/'.join(segment_patterns) + '()')
+            group_count += len(params) + 1
+            # pad so the marker group's number indexes this entry
+            while len(match_table) < group_count:
+                match_table.append(None)
+
+            match_table.append((routes[path][0], params))
+
+        self._match_table = match_table
+        self._compiled = re.compile('(?:%s)$' % '|'.join(branches)) if branches else None
+        self._dirty = False
+        self.freeze()
+
+    def freeze(self):
+        """Compact the route tree once registration is complete
+
+        The per-node children and methods dicts were grown one insert at
+        a time, so their hash tables carry doubling slack; rebuilding
+        them right-sizes every table. The nodes stay mutable — a later
+        add_route simply grows them again.
+        """
+        stack = [self.tree]
+        while stack:
+            node = stack.pop()
+            # empty buckets collapse back onto the shared dict; non-empty
+            # ones are rebuilt to drop their doubling slack
+            node.children = dict(node.children) if node.children else _EMPTY_DICT
+            node.methods = dict(node.methods) if node.methods else _EMPTY_DICT
+            stack.extend(child for _key, child in node.iter_children())
 
     def static(self, prefix: str, local_path: str, only_files: Optional[List[str]]=None):
         """
@@ -454,6 +780,12 @@ class Router:
         """
         self.middleware.insert(0, middleware)
 
+        chain = None
+        for mw in self.middleware:
+            chain = mw if chain is None else _wrap_middleware(mw, chain)
+
+        self._middleware_chain = chain
+
     def add_route(self,
                   uri_path: str,
                   handler: RequestHandler,
@@ -471,6 +803,9 @@ class Router:
         uri_parts = _make_uri_parts(uri_path)
         handler_to_url_updates = self.tree.add_handler(uri_parts, handler=handler, methods=methods)
         self.handler_to_url.update(handler_to_url_updates)
+        self._compiled = None
+        self._dirty = True
+        self._lookup_cache.clear()
 
     def attach(self,
                router: 'Router',
@@ -491,8 +826,37 @@ class Router:
             base_path = ""
 
         router.tree.reset_prefix(base_path)
-        handler_to_url_updates = self.tree.merge_with(router.tree)
-        self.handler_to_url.update(handler_to_url_updates)
+
+        base_parts = _make_uri_parts(base_path)
+        if any(_parse_uri_parameter(part)[0] is not None for part in base_parts):
+            # a parameterized base needs the full per-route re-insert so
+            # the parameter bookkeeping stays consistent
+            handler_to_url_updates = self.tree.merge_with(router.tree)
+            self.handler_to_url.update(handler_to_url_updates)
+        else:
+            # splice: walk/create the base chain, then graft the
+            # sub-tree's nodes directly instead of re-inserting every
+            # route. The sub-router's nodes are shared from here on, so
+            # it should not be mutated after attaching.
+            dest = self.tree
+            for part in base_parts:
+                child = dest.children.get(part)
+                if child is None:
+                    child = dest._add_child(part, None, None)
+
+                dest = child
+
+            src = router.tree.children.get('')
+            if src is not None:
+                dest._graft(src)
+
+            for name_method, (path, req_args) in router.handler_to_url.items():
+                new_path = (base_path or "/") if path == "/" else f"{base_path}{path}"
+                self.handler_to_url[name_method] = (new_path, req_args)
+
+        self._compiled = None
+        self._dirty = True
+        self._lookup_cache.clear()
 
     def handler_and_args_for(self,
                              uri_path: str,
@@ -507,8 +871,57 @@ class Router:
         Returns:
 
         """
+        cache = self._lookup_cache
+        cache_key = (method, uri_path)
+        hit = cache.get(cache_key)
+        if hit is not None:
+            cache.move_to_end(cache_key)
+            handler, handler_args = hit
+            # hand out a copy so no caller can corrupt the cached args;
+            # parameterless hits share the read-only empty mapping
+            return handler, dict(handler_args) if handler_args else _EMPTY_ARGS
+
+        # (re)compile lazily so the C-level matcher serves steady-state
+        # traffic without callers ever invoking finalize() themselves
+        if self._dirty:
+            self.finalize()
+
+        compiled = self._compiled
+        if compiled is not None:
+            stripped = uri_path.strip('/')
+            match = compiled.match(f"/{stripped}" if stripped else "/")
+            if match is not None:
+                marker = match.lastindex
+                methods, params = self._match_table[marker]
+                handler = methods.get(_METHOD_CANONICAL.get(method) or method.upper())
+                if handler is not None:
+                    if params:
+                        handler_args = {}
+                        for group, (param_name, coerce) in zip(range(marker - len(params), marker), params):
+                            handler_args[param_name] = coerce(match[group])
+                    else:
+                        handler_args = _EMPTY_ARGS
+
+                    return handler, self._remember(cache_key, handler, handler_args)
+
         uri_parts = _make_uri_parts(uri_path)
-        return self.tree.get_handler_and_args(uri_parts, method=method)
+        handler, handler_args = self.tree._find(uri_parts, method)
+        if handler is _NOT_FOUND:
+            node, i = handler_args
+            raise RouteNotFound(f"Could not find route for '{node.prefix_stripped}/{uri_parts[i]}'")
+
+        return handler, self._remember(cache_key, handler, handler_args)
+
+    def _remember(self, cache_key, handler, handler_args) -> dict:
+        """Store a lookup result, evicting the oldest entry when full"""
+        cache = self._lookup_cache
+        # keep a private copy of the args; the returned dict belongs to
+        # the caller and must not be able to corrupt later hits
+        cache[cache_key] = (handler, dict(handler_args))
+        if len(cache) > _LOOKUP_CACHE_MAX:
+            cache.popitem(last=False)
+
+        return handler_args
 
     async def dispatch(self, request):
         """
@@ -520,11 +933,30 @@ class Router:
 
         """
         _handler, handler_args = self.handler_and_args_for(request.path, method=request.method)
-        handler = functools.partial(_handler, **handler_args)
-        functools.update_wrapper(handler, _handler)
+        if self._middleware_chain is None:
+            return await _handler(request, **handler_args)
+
+        if not handler_args:
+            # parameterless routes (the common case) reuse one bound
+            # entry per handler instead of allocating a closure per
+            # request; the middleware chain wraps it from outside, so
+            # the cache never needs invalidating
+            call_handler = self._entry_cache.get(_handler)
+            if call_handler is None:
+                async def call_handler(req, _handler=_handler):
+                    return await _handler(req)
+
+                call_handler.__wrapped__ = _handler
+                self._entry_cache[_handler] = call_handler
+
+            return await self._middleware_chain(request, call_handler)
+
+        async def call_handler(req):
+            return await _handler(req, **handler_args)
 
-        for middleware in self.middleware:
-            handler = functools.partial(middleware, next_handler=handler)
-            functools.update_wrapper(handler, middleware)
+        # one attribute write keeps the real handler reachable for
+        # introspection; __name__/__qualname__/__doc__ are deliberately
+        # not propagated (middleware should unwrap via __wrapped__)
+        call_handler.__wrapped__ = _handler
 
-        return await handler(request)
+        return await self._middleware_chain(request, call_handler)
@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 """Static file handling"""
 
+import asyncio
+import collections
 import logging
 import mimetypes
 import os
-from typing import List, Optional
+import time
+from typing import List, Optional, Tuple
 
 import aiofiles
 
@@ -34,6 +37,22 @@ mimetypes.add_type("application/vnd.ms-fontobject", "eot", strict=False)
 mimetypes.add_type("application/font-sfnt", "sfnt", strict=False)
 
 
+# bounds for the per-handler path resolution cache; entries expire so
+# files added after startup still become visible
+_RESOLVE_CACHE_MAX = 512
+_RESOLVE_CACHE_TTL = 60.0
+
+# below this size, one threadpool hop reading the whole file is cheaper
+# than aiofiles dispatching open/read/close as three separate hops
+_SMALL_FILE_MAX = 256 * 1024
+
+
+def _read_bytes(path: str) -> bytes:
+    """Read a file in one go; runs inside the default executor"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
 class StaticFileHandler:
 
     def __init__(self,
@@ -48,6 +67,10 @@ class StaticFileHandler:
         self._handler_404 = handler_404 or self._default_404
 
         self.logger = logger or setup_logger("owlbear.staticfilehandler")
+        self._resolve_cache = collections.OrderedDict()
+        # extension -> content type; a static tree uses a handful of
+        # extensions, so guess_type runs once per extension ever seen
+        self._ext_types = {}
 
         if only_files is None:
             self._only_files = None
@@ -58,38 +81,78 @@ class StaticFileHandler:
     async def _default_404(request):
         return owlbear.response.html_response('Not found', 404)
 
-    async def __call__(self, request: owlbear.request.Request):
-        _, local_relpath = request.path.split(self._prefix, 1)
+    def _resolve(self, request_path: str) -> Tuple[str, bool, int, str]:
+        """Map a request path to (local path, exists, size, content type)
+
+        Resolution costs an abspath plus a stat plus a mimetypes walk
+        per request; the hot static URLs of an app are few and stable,
+        so results are kept in a bounded LRU with a TTL so new files
+        still show up.
+        """
+        now = time.monotonic()
+        entry = self._resolve_cache.get(request_path)
+        if entry is not None and now - entry[0] < _RESOLVE_CACHE_TTL:
+            self._resolve_cache.move_to_end(request_path)
+            return entry[1]
+
+        _, local_relpath = request_path.split(self._prefix, 1)
         local_relpath = local_relpath.lstrip("/")
         local_path = os.path.abspath(os.path.join(self._local_path, local_relpath))
 
-        self.logger.debug("Finding static file", prefix=self._prefix, request_path=request.path, local_relpath=local_relpath, local_path=local_path)
-
         if not local_path.startswith(self._local_path):
-            self.logger.debug("Static file '{}' requested outside of static directory".format(local_path))
-            raise ValueError("Static file '{}' requested outside of static directory".format(local_path))
+            self.logger.debug(f"Static file '{local_path}' requested outside of static directory")
+            raise ValueError(f"Static file '{local_path}' requested outside of static directory")
+
+        # one stat answers both the existence check and the size used to
+        # pick the read strategy
+        try:
+            size = os.stat(local_path).st_size
+            exists = True
+        except OSError:
+            size = -1
+            exists = False
+
+        ext = os.path.splitext(local_path)[1].lower()
+        content_type = self._ext_types.get(ext)
+        if content_type is None:
+            guess = mimetypes.guess_type(local_path, strict=False)
+            if guess is not None:
+                content_type = guess[0] or "application/octet-stream"
+            else:
+                content_type = "application/octet-stream"
+
+            self._ext_types[ext] = content_type
+
+        result = (local_path, exists, size, content_type)
+        cache = self._resolve_cache
+        cache[request_path] = (now, result)
+        if len(cache) > _RESOLVE_CACHE_MAX:
+            cache.popitem(last=False)
+
+        return result
 
-        if not os.path.exists(local_path):
-            self.logger.debug("Static file '{}' does not exist".format(local_path))
+    async def __call__(self, request: owlbear.request.Request):
+        local_path, exists, size, content_type = self._resolve(request.path)
+
+        if not exists:
+            self.logger.debug(f"Static file '{local_path}' does not exist")
             return await self._handler_404(request)
 
         _, resolved_relpath = local_path.split(self._local_path, 1)
         resolved_relpath.lstrip("/")
 
         if self._only_files is not None and resolved_relpath not in self._only_files:
-            self.logger.debug("Static file '{}' is not in the only_files list".format(local_path), only_files=self._only_files)
+            self.logger.debug(f"Static file '{local_path}' is not in the only_files list")
             return await self._handler_404(request)
 
         resp = owlbear.response.Response()
-        async with aiofiles.open(local_path, 'rb') as f:
-            resp.set_content(await f.read(), encoding=None)
-
-        guess = mimetypes.guess_type(local_path, strict=False)
-        if guess is not None:
-            resp.content_type = guess[0] or "application/octet-stream"
+        if size < _SMALL_FILE_MAX:
+            content = await asyncio.get_running_loop().run_in_executor(None, _read_bytes, local_path)
         else:
-            resp.content_type = "application/octet-stream"
+            async with aiofiles.open(local_path, 'rb') as f:
+                content = await f.read()
 
-        self.logger.debug("Static file '{}' found".format(local_path), content_type=resp.content_type)
+        resp.set_content(content, encoding=None)
+        resp.content_type = content_type
 
         return resp
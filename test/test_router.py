@@ -59,6 +59,75 @@ def test_add_route_and_lookup_handlers():
         print(item)
 
 
+def test_overlapping_routes_prefer_static_segments():
+    mock_handler1 = MagicMock()
+    coro_mock_handler1 = test_helpers.make_coroutine(mock_handler1)
+
+    mock_handler2 = MagicMock()
+    coro_mock_handler2 = test_helpers.make_coroutine(mock_handler2)
+
+    mock_handler3 = MagicMock()
+    coro_mock_handler3 = test_helpers.make_coroutine(mock_handler3)
+
+    mock_handler4 = MagicMock()
+    coro_mock_handler4 = test_helpers.make_coroutine(mock_handler4)
+
+    my_router = router.Router()
+    my_router.add_route("/a/<x: str>", coro_mock_handler1)
+    my_router.add_route("/<y: str>/b", coro_mock_handler2)
+    my_router.add_route("/a/<x: str>/<z: str>", coro_mock_handler3)
+    my_router.add_route("/<y: str>/b/c", coro_mock_handler4)
+
+    # the compiled fast path must keep the tree's static-before-parameter
+    # preference at every segment, not just for fully-static paths
+    my_router.finalize()
+
+    handler, args = my_router.handler_and_args_for("/a/b", "GET")
+    assert handler is coro_mock_handler1
+    assert args == {'x': 'b'}
+
+    handler, args = my_router.handler_and_args_for("/q/b", "GET")
+    assert handler is coro_mock_handler2
+    assert args == {'y': 'q'}
+
+    handler, args = my_router.handler_and_args_for("/a/b/c", "GET")
+    assert handler is coro_mock_handler3
+    assert args == {'x': 'b', 'z': 'c'}
+
+    handler, args = my_router.handler_and_args_for("/q/b/c", "GET")
+    assert handler is coro_mock_handler4
+    assert args == {'y': 'q'}
+
+
+def test_finalized_lookup_matches_tree_walk():
+    # lookups finalize lazily, so steady-state traffic is answered by the
+    # compiled matcher while cold paths fall back to the tree walk; the
+    # two must agree on every route or dispatch is internally inconsistent
+    route_paths = ("/", "/a/b", "/a/<x: str>", "/<y: str>/b", "/files/special", "/files/<name: str>")
+
+    my_router = router.Router()
+    handlers = {}
+    for route_path in route_paths:
+        mock_handler = MagicMock()
+        handlers[route_path] = test_helpers.make_coroutine(mock_handler)
+        my_router.add_route(route_path, handlers[route_path])
+
+    request_paths = ("/", "/a/b", "/a/q", "/q/b", "/files/special", "/files/other")
+
+    tree_results = [
+        my_router.tree.get_handler_and_args(router._make_uri_parts(request_path), "GET")
+        for request_path in request_paths
+    ]
+
+    my_router.finalize()
+    assert my_router._compiled is not None
+
+    for request_path, (tree_handler, tree_args) in zip(request_paths, tree_results):
+        handler, args = my_router.handler_and_args_for(request_path, "GET")
+        assert handler is tree_handler
+        assert dict(args) == dict(tree_args)
+
+
 def test_attach_router():
     mock_handler1 = MagicMock()
     coro_mock_handler1 = test_helpers.make_coroutine(mock_handler1)